@@ -0,0 +1,120 @@
+import logging
+import os
+import queue
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Union
+
+LOG_FILE = 'api_calls.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Upper bounds (in ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def setup_logging(log_file: str = LOG_FILE, level: Optional[str] = None,
+                  max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3) -> QueueListener:
+    """Send all logging through a queue drained by a background writer thread
+
+    The level defaults to the API_LOG_LEVEL environment variable (INFO if unset).
+    Call stop() on the returned listener to flush remaining records before exiting.
+    """
+    level = (level or os.environ.get('API_LOG_LEVEL', 'INFO')).upper()
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    # Callers only enqueue records; file and console I/O happen on the listener thread
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # QueueHandler pre-formats the message; keep it bare so the writer's formatter applies once
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class RequestLog:
+    """Structured per-request records with sampled success lines and an end-of-run summary"""
+
+    def __init__(self, sample_every: Optional[int] = None, logger_name: str = 'api_calls'):
+        self.logger = logging.getLogger(logger_name)
+        # Every Nth success is logged at INFO, the rest at DEBUG
+        if sample_every is None:
+            sample_every = int(os.environ.get('API_LOG_SAMPLE', '50'))
+        self.sample_every = max(1, sample_every)
+        self.status_counts = Counter()
+        self.latency_histogram = Counter()
+        self.total_requests = 0
+        self.successes = 0
+        self.total_bytes = 0
+        self.total_retries = 0
+        self.total_latency = 0.0
+
+    def _bucket(self, latency_ms: float) -> str:
+        """Histogram bucket label for a latency"""
+        for bound in LATENCY_BUCKETS_MS:
+            if latency_ms <= bound:
+                return f"<= {bound} ms"
+        return f"> {LATENCY_BUCKETS_MS[-1]} ms"
+
+    def record(self, request_id: str, status: Union[int, str], latency: float,
+               size: int = 0, retries: int = 0, error: Optional[str] = None):
+        """Record one API call exactly once with its final outcome
+
+        status is the HTTP status, 'invalid_json' if a 200 body could not be decoded,
+        or 'error' if no response was received.
+        """
+        latency_ms = latency * 1000
+        self.total_requests += 1
+        self.status_counts[str(status)] += 1
+        self.latency_histogram[self._bucket(latency_ms)] += 1
+        self.total_bytes += size
+        self.total_retries += retries
+        self.total_latency += latency
+
+        fields = {
+            'request_id': request_id,
+            'status': status,
+            'latency_ms': round(latency_ms, 1),
+            'bytes': size,
+            'retries': retries,
+        }
+        if error:
+            fields['error'] = error
+        message = ' '.join(f"{key}={value}" for key, value in fields.items())
+
+        if status == 200:
+            self.successes += 1
+            level = logging.INFO if self.successes % self.sample_every == 0 else logging.DEBUG
+        elif status == 429:
+            level = logging.WARNING
+        else:
+            level = logging.ERROR
+        self.logger.log(level, message, extra={'request': fields})
+
+    def write_summary(self):
+        """Log status counts and a latency histogram for the run"""
+        if not self.total_requests:
+            self.logger.info("Request summary: no API calls made")
+            return
+
+        average_ms = self.total_latency / self.total_requests * 1000
+        self.logger.info(
+            f"Request summary: requests={self.total_requests} successes={self.successes} "
+            f"bytes={self.total_bytes} retries={self.total_retries} avg_latency_ms={average_ms:.1f}"
+        )
+        statuses = ', '.join(f"{status}={count}" for status, count in sorted(self.status_counts.items()))
+        self.logger.info(f"Status counts: {statuses}")
+
+        labels = [f"<= {bound} ms" for bound in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]} ms"]
+        widest = max(self.latency_histogram.values())
+        for label in labels:
+            count = self.latency_histogram[label]
+            bar = '#' * round(40 * count / widest)
+            self.logger.info(f"Latency {label:>11}: {count:6d} {bar}")
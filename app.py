@@ -1,15 +1,64 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, Response, stream_with_context, url_for, abort
 import json
 import os
 from pathlib import Path
 import glob
+import mimetypes
+import posixpath
+
+from exporter import CorpusExporter, EXPORT_FORMATS, parse_fields
+from metadata_table import MetadataTable, DIMENSIONS
 
 app = Flask(__name__)
 
+# Output of build_assets.py
+ASSET_DIR = os.path.join(app.static_folder, 'dist')
+
+# Used for any asset missing from the build manifest (e.g. build_assets.py has not been run)
+ASSET_FALLBACKS = {
+    'vendor/inter.css': 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap',
+    'vendor/fontawesome.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+    'vendor/mathjax.js': 'https://cdn.jsdelivr.net/npm/mathjax@3/es5/mml-chtml.js',
+    'vendor/mathjax-fonts': 'https://cdn.jsdelivr.net/npm/mathjax@3/es5/output/chtml/fonts/woff-v2',
+}
+
+def load_asset_manifest():
+    """Load the logical name -> fingerprinted path map written by build_assets.py"""
+    try:
+        with open(os.path.join(ASSET_DIR, 'manifest.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+asset_manifest = load_asset_manifest()
+
+def is_fingerprinted_asset(filename):
+    """Whether a build output path is content-hashed or lives under a versioned vendor directory"""
+    filename = posixpath.normpath(filename)
+    if filename in asset_manifest.values():
+        return True
+    # Fonts referenced by vendored stylesheets and MathJax sit beside their versioned entry files
+    return any(
+        name.startswith('vendor/') and filename.startswith(os.path.dirname(path) + '/')
+        for name, path in asset_manifest.items()
+    )
+
+@app.context_processor
+def inject_asset_url():
+    """Expose asset_url() to templates"""
+    def asset_url(name):
+        if name in asset_manifest:
+            return url_for('get_asset', filename=asset_manifest[name])
+        if name in ASSET_FALLBACKS:
+            return ASSET_FALLBACKS[name]
+        return url_for('static', filename=name)
+    return {'asset_url': asset_url}
+
 class QuestionFinder:
     def __init__(self):
         self.question_folders = []
         self.scan_folders()
+        self.metadata = MetadataTable.load()
     
     def scan_folders(self):
         """Scan for all question folders"""
@@ -108,11 +157,15 @@ class QuestionFinder:
     def get_available_folders(self):
         """Get list of available folders with question counts"""
         folder_info = []
+        folder_counts = self.metadata.folder_counts()
         for folder in self.question_folders:
-            json_files = glob.glob(os.path.join(folder, '*.json'))
+            # Folders without a questionData manifest still need a directory listing
+            count = folder_counts.get(folder)
+            if count is None:
+                count = len(glob.glob(os.path.join(folder, '*.json')))
             folder_info.append({
                 'name': folder,
-                'count': len(json_files)
+                'count': count
             })
         return folder_info
 
@@ -123,6 +176,28 @@ def index():
     """Serve the main page"""
     return render_template('index.html')
 
+@app.route('/assets/<path:filename>')
+def get_asset(filename):
+    """Serve fingerprinted build output with far-future caching and precompressed variants"""
+    # Only immutable files are served; the manifest itself is rewritten on every build
+    if not is_fingerprinted_asset(filename):
+        abort(404)
+    
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype)
+    
+    # File names change whenever their content does, so they never need revalidating
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.headers.pop('Content-Disposition', None)
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/question/<question_id>')
 def get_question(question_id):
     """API endpoint to get a question by ID"""
@@ -159,5 +234,48 @@ def get_questions_in_folder(folder_name):
         'count': len(question_ids)
     })
 
+@app.route('/api/stats')
+def get_stats():
+    """API endpoint to get question counts grouped by class, skill, difficulty and score band"""
+    by = parse_fields(request.args.get('by')) or ['class', 'skill', 'difficulty', 'score_band']
+    filters = {name: request.args[name] for name in DIMENSIONS if name in request.args}
+    
+    unknown = [name for name in by if name not in DIMENSIONS]
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown dimension: {', '.join(unknown)}"}), 400
+    
+    try:
+        stats = question_finder.metadata.stats(
+            by,
+            filters=filters,
+            available_only=request.args.get('available') in ('1', 'true')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, **stats})
+
+@app.route('/api/export')
+def export_corpus():
+    """API endpoint to stream the joined question bank as NDJSON or Parquet"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'error': f'Unsupported export format: {export_format}'}), 400
+    
+    try:
+        # Parse in-process: a pool per request would let any client fork cpu_count() workers
+        # from this multi-threaded server, and a sequential export already takes under a second
+        chunks = CorpusExporter(workers=1, metadata=question_finder.metadata).iter_export(export_format, parse_fields(request.args.get('fields')))
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)}), 501
+    
+    if export_format == 'parquet':
+        return Response(
+            stream_with_context(chunks),
+            mimetype='application/vnd.apache.parquet',
+            headers={'Content-Disposition': 'attachment; filename=questions.parquet'}
+        )
+    return Response(stream_with_context(chunks), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
@@ -0,0 +1,197 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import urllib.request
+from typing import Dict, List
+from urllib.parse import urljoin, urlparse
+
+import rcssmin
+import rjsmin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = 'static'
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+# First-party assets: logical name -> source file under static/
+APP_ASSETS = ('css/style.css', 'js/app.js')
+
+MATHJAX_VERSION = '3.2.2'
+# The corpus is pure MathML, so only the MathML input + CommonHTML output component is needed
+MATHJAX_URL = f'https://cdn.jsdelivr.net/npm/mathjax@{MATHJAX_VERSION}/es5/mml-chtml.js'
+MATHJAX_FONT_URL = f'https://cdn.jsdelivr.net/npm/mathjax@{MATHJAX_VERSION}/es5/output/chtml/fonts/woff-v2/'
+
+FONTAWESOME_URLS = [
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/fontawesome.min.css',
+    # Only solid icons ("fas") are used by the viewer
+    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/solid.min.css',
+]
+INTER_URLS = [
+    'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap',
+]
+
+# Google Fonts only serves woff2 to browsers it recognises
+BROWSER_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+# Already-compressed formats gain nothing from gzip/brotli
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.svg', '.ttf', '.json')
+
+CSS_URL_PATTERN = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)')
+
+
+def fetch(url: str) -> bytes:
+    """Download a URL"""
+    request = urllib.request.Request(url, headers={'User-Agent': BROWSER_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def content_hash(data: bytes) -> str:
+    """Short content fingerprint used in file names"""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def fingerprinted_name(path: str, data: bytes) -> str:
+    """Insert the content hash before the file extension"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def write_file(relative_path: str, data: bytes) -> str:
+    """Write a file under the dist directory"""
+    output_path = os.path.join(DIST_DIR, relative_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return output_path
+
+
+def minify(path: str, data: bytes) -> bytes:
+    """Minify CSS or JavaScript"""
+    text = data.decode('utf-8')
+    if path.endswith('.css'):
+        return rcssmin.cssmin(text).encode('utf-8')
+    if path.endswith('.js'):
+        return rjsmin.jsmin(text).encode('utf-8')
+    return data
+
+
+def build_app_assets(manifest: Dict[str, str]):
+    """Minify and fingerprint the viewer's own CSS and JavaScript"""
+    for name in APP_ASSETS:
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            data = minify(name, f.read())
+        output_name = fingerprinted_name(name, data)
+        write_file(output_name, data)
+        manifest[name] = output_name
+        print(f"Built {name} -> {output_name}")
+
+
+def vendor_css(name: str, urls: List[str], manifest: Dict[str, str]):
+    """Download stylesheets and every font they reference, rewriting URLs to the local copies"""
+    output_dir = os.path.join('vendor', name)
+    downloaded = {}
+    stylesheets = []
+
+    for css_url in urls:
+        css = fetch(css_url).decode('utf-8')
+
+        def localize(match):
+            reference = match.group(1)
+            if reference.startswith('data:'):
+                return match.group(0)
+            font_url = urljoin(css_url, reference)
+            if font_url not in downloaded:
+                data = fetch(font_url)
+                font_name = fingerprinted_name(os.path.basename(urlparse(font_url).path), data)
+                write_file(os.path.join(output_dir, 'fonts', font_name), data)
+                downloaded[font_url] = font_name
+            return f"url(fonts/{downloaded[font_url]})"
+
+        stylesheets.append(CSS_URL_PATTERN.sub(localize, css))
+
+    data = minify('.css', '\n'.join(stylesheets).encode('utf-8'))
+    output_name = fingerprinted_name(os.path.join(output_dir, f"{name}.css"), data)
+    write_file(output_name, data)
+    manifest[f"vendor/{name}.css"] = output_name
+    print(f"Vendored {name}: {len(downloaded)} font files")
+
+
+def vendor_mathjax(manifest: Dict[str, str]):
+    """Download the MathML-only MathJax component and the CHTML fonts it loads"""
+    output_dir = os.path.join('vendor', f"mathjax-{MATHJAX_VERSION}")
+    script = fetch(MATHJAX_URL)
+
+    font_names = sorted(set(re.findall(rb'MathJax_[A-Za-z0-9-]+\.woff', script)))
+    if not font_names:
+        raise RuntimeError("Could not find any font references in the MathJax component")
+    for font_name in font_names:
+        font_name = font_name.decode('ascii')
+        write_file(os.path.join(output_dir, 'fonts', font_name), fetch(MATHJAX_FONT_URL + font_name))
+
+    output_name = fingerprinted_name(os.path.join(output_dir, 'mml-chtml.js'), script)
+    write_file(output_name, script)
+    manifest['vendor/mathjax.js'] = output_name
+    # MathJax requests fonts by fixed name, so the versioned directory is the fingerprint
+    manifest['vendor/mathjax-fonts'] = os.path.join(output_dir, 'fonts')
+    print(f"Vendored MathJax {MATHJAX_VERSION}: {len(font_names)} font files")
+
+
+def precompress():
+    """Write .gz and (if brotli is installed) .br siblings for compressible files"""
+    count = 0
+    for root, _, files in os.walk(DIST_DIR):
+        for file_name in files:
+            if not file_name.endswith(COMPRESSIBLE_EXTENSIONS) or file_name == MANIFEST_NAME:
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+            count += 1
+    print(f"Precompressed {count} files" + ('' if brotli else ' (gzip only, install brotli for .br)'))
+
+
+def main():
+    """Main function"""
+    arg_parser = argparse.ArgumentParser(description='Build fingerprinted static assets into static/dist')
+    arg_parser.add_argument('--no-vendor', action='store_true',
+                            help='Skip downloading third-party assets (the page falls back to their CDNs)')
+    args = arg_parser.parse_args()
+
+    if os.path.exists(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = {}
+    build_app_assets(manifest)
+    if not args.no_vendor:
+        vendor_css('inter', INTER_URLS, manifest)
+        vendor_css('fontawesome', FONTAWESOME_URLS, manifest)
+        vendor_mathjax(manifest)
+    precompress()
+
+    # Manifest paths always use forward slashes since they become URLs
+    manifest = {name: path.replace(os.sep, '/') for name, path in manifest.items()}
+    with open(os.path.join(DIST_DIR, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Wrote {len(manifest)} entries to {os.path.join(DIST_DIR, MANIFEST_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
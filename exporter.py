@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from metadata_table import MetadataTable
+
+# Integer-valued columns in the questionData manifests
+INT_COLUMNS = ('updateDate', 'createDate', 'score_band_range_cd')
+
+# Fixed column order for the columnar export (manifest fields first, then question fields)
+EXPORT_COLUMNS = (
+    'questionId', 'folder', 'external_id', 'uId', 'program', 'pPcc',
+    'primary_class_cd', 'primary_class_cd_desc', 'skill_cd', 'skill_desc',
+    'difficulty', 'score_band_range_cd', 'ibn', 'createDate', 'updateDate',
+    'type', 'stimulus', 'stem', 'answerOptions', 'keys', 'correct_answer',
+    'rationale', 'externalid', 'vaultid', 'origin', 'templateid',
+    'templateclusterid', 'templateclustername', 'parenttemplateid',
+    'parenttemplatename', 'position',
+)
+
+EXPORT_FORMATS = ('ndjson', 'parquet')
+
+
+def _load_records(tasks: List[Tuple[str, str, Dict]], fields: Optional[Tuple[str, ...]]) -> List[Dict]:
+    """Parse a chunk of question files and join each with its manifest record (runs in a worker)"""
+    records = []
+    for file_path, folder, metadata in tasks:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            question = json.load(f)
+
+        record = {'questionId': os.path.splitext(os.path.basename(file_path))[0]}
+        record.update(metadata)
+        record['folder'] = folder
+        record.update(question)
+
+        if fields:
+            record = {field: record.get(field) for field in fields}
+        records.append(record)
+    return records
+
+
+class _ChunkSink:
+    """Minimal write-only file object that buffers bytes until drained"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class CorpusExporter:
+    def __init__(self, content_dirs=('eng', 'math'), manifest_dir='questionData',
+                 workers: Optional[int] = None, chunk_size: int = 32,
+                 metadata: Optional[MetadataTable] = None):
+        self.content_dirs = content_dirs
+        self.manifest_dir = manifest_dir
+        # Pass an already-loaded table (as the server does) to avoid re-parsing the manifests
+        self.metadata = metadata
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+    def load_metadata(self) -> MetadataTable:
+        """Return the questionData metadata table, loading it on first use"""
+        if self.metadata is None:
+            self.metadata = MetadataTable.load(self.manifest_dir)
+        return self.metadata
+
+    def iter_question_files(self) -> Iterator[Tuple[str, str]]:
+        """Yield (folder, file_path) for every question file without listing the whole tree up front"""
+        for content_dir in self.content_dirs:
+            if not os.path.isdir(content_dir):
+                continue
+            for item in sorted(os.listdir(content_dir)):
+                folder = os.path.join(content_dir, item)
+                if not os.path.isdir(folder):
+                    continue
+                # Sorted so export row order does not depend on the filesystem
+                with os.scandir(folder) as entries:
+                    names = sorted(entry.name for entry in entries if entry.is_file() and entry.name.endswith('.json'))
+                for name in names:
+                    yield folder.replace('\\', '/'), os.path.join(folder, name)
+
+    def _iter_chunks(self) -> Iterator[List[Tuple[str, str, Dict]]]:
+        """Group question files into worker-sized chunks, each carrying its manifest record"""
+        metadata = self.load_metadata()
+        chunk = []
+        for folder, file_path in self.iter_question_files():
+            question_id = os.path.splitext(os.path.basename(file_path))[0]
+            chunk.append((file_path, folder, metadata.record(question_id)))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_records(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Yield joined question+metadata records, parsing files in parallel with a bounded window"""
+        fields = tuple(fields) if fields else None
+
+        if self.workers <= 1:
+            for chunk in self._iter_chunks():
+                yield from _load_records(chunk, fields)
+            return
+
+        # Only keep a few chunks in flight so memory stays constant regardless of corpus size
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        try:
+            for chunk in self._iter_chunks():
+                pending.append(pool.submit(_load_records, chunk, fields))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def iter_ndjson(self, fields: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """Yield one JSON line per record"""
+        for record in self.iter_records(fields):
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    def _parquet_schema(self, fields: Optional[Iterable[str]]):
+        """Build a fixed Arrow schema; nested values are stored as JSON strings"""
+        import pyarrow as pa
+
+        columns = tuple(fields) if fields else EXPORT_COLUMNS
+        return pa.schema([
+            (column, pa.int64() if column in INT_COLUMNS else pa.string())
+            for column in columns
+        ])
+
+    def _record_batches(self, schema, batch_size: int):
+        """Yield Arrow tables of at most batch_size rows"""
+        import pyarrow as pa
+
+        columns = {name: [] for name in schema.names}
+        rows = 0
+        for record in self.iter_records(schema.names):
+            for name, values in columns.items():
+                value = record.get(name)
+                if isinstance(value, (list, dict)):
+                    value = json.dumps(value, ensure_ascii=False)
+                elif value is not None and name not in INT_COLUMNS:
+                    value = str(value)
+                values.append(value)
+            rows += 1
+            if rows >= batch_size:
+                yield pa.table(columns, schema=schema)
+                columns = {name: [] for name in schema.names}
+                rows = 0
+        if rows:
+            yield pa.table(columns, schema=schema)
+
+    def iter_parquet(self, fields: Optional[Iterable[str]] = None, batch_size: int = 500) -> Iterator[bytes]:
+        """Yield a Parquet file as byte chunks, one row group at a time"""
+        import pyarrow.parquet as pq
+
+        schema = self._parquet_schema(fields)
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        try:
+            for table in self._record_batches(schema, batch_size):
+                writer.write_table(table)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def iter_export(self, export_format: str, fields: Optional[Iterable[str]] = None):
+        """Dispatch to the streaming generator for the requested format"""
+        if export_format == 'ndjson':
+            return self.iter_ndjson(fields)
+        if export_format == 'parquet':
+            # Checked eagerly so a missing optional dependency fails before any output is sent
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+            return self.iter_parquet(fields)
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated field list"""
+    if not value:
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def main():
+    """Main function"""
+    arg_parser = argparse.ArgumentParser(description='Export the question bank joined with its metadata')
+    arg_parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson', help='Output format')
+    arg_parser.add_argument('--output', '-o', help='Output file (defaults to stdout for ndjson)')
+    arg_parser.add_argument('--fields', help='Comma-separated list of fields to include')
+    arg_parser.add_argument('--workers', type=int, default=None, help='Number of parser processes')
+    args = arg_parser.parse_args()
+
+    if args.format == 'parquet' and not args.output:
+        arg_parser.error('--output is required for parquet exports')
+
+    exporter = CorpusExporter(workers=args.workers)
+    try:
+        chunks = exporter.iter_export(args.format, parse_fields(args.fields))
+    except RuntimeError as e:
+        arg_parser.error(str(e))
+
+    if args.output:
+        mode = 'wb' if args.format == 'parquet' else 'w'
+        encoding = None if args.format == 'parquet' else 'utf-8'
+        with open(args.output, mode, encoding=encoding) as f:
+            for chunk in chunks:
+                f.write(chunk)
+    else:
+        try:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. piped into head): stop the workers and exit quietly
+            chunks.close()
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
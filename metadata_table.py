@@ -0,0 +1,236 @@
+import glob
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Low-cardinality string fields stored as small integer codes into an interned label list
+CATEGORY_COLUMNS = (
+    'folder', 'program', 'pPcc', 'primary_class_cd', 'primary_class_cd_desc',
+    'skill_cd', 'skill_desc', 'difficulty', 'ibn',
+)
+
+# Epoch-millisecond timestamps
+DATE_COLUMNS = ('createDate', 'updateDate')
+
+# High-cardinality ASCII identifiers stored as fixed-width byte strings (decode at the API boundary)
+ID_COLUMNS = ('questionId', 'external_id', 'uId')
+
+# Public names for the dimensions /api/stats can group and filter by
+DIMENSIONS = {
+    'class': 'primary_class_cd_desc',
+    'skill': 'skill_desc',
+    'difficulty': 'difficulty',
+    'score_band': 'score_band_range_cd',
+    'folder': 'folder',
+}
+
+
+def _code_dtype(size: int):
+    """Smallest unsigned integer dtype that can index size labels"""
+    if size <= np.iinfo(np.uint8).max:
+        return np.uint8
+    if size <= np.iinfo(np.uint16).max:
+        return np.uint16
+    return np.uint32
+
+
+def manifest_folder(manifest_path: str) -> str:
+    """Map questionData/math/math_algebra.json to the math/algebra question folder"""
+    content_dir = os.path.basename(os.path.dirname(manifest_path))
+    name = os.path.splitext(os.path.basename(manifest_path))[0]
+    return os.path.join(content_dir, name.split('_', 1)[-1].strip())
+
+
+class CategoryColumn:
+    """Dictionary-encoded string column"""
+
+    def __init__(self, values: Iterable[Optional[str]]):
+        index = {}
+        labels = []
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = len(labels)
+                index[value] = code
+                labels.append(sys.intern(value) if isinstance(value, str) else value)
+            codes.append(code)
+        self.labels = labels
+        self.codes = np.array(codes, dtype=_code_dtype(len(labels)))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row: int):
+        return self.labels[self.codes[row]]
+
+    def code_of(self, label) -> int:
+        """Code for a label, or -1 if the label never occurs"""
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            return -1
+
+
+class MetadataTable:
+    """Column-oriented view of the questionData manifests"""
+
+    def __init__(self, records: List[Dict]):
+        self.size = len(records)
+        self.categories = {
+            column: CategoryColumn(record.get(column) for record in records)
+            for column in CATEGORY_COLUMNS
+        }
+        self.dates = {
+            column: np.array([record.get(column) or 0 for record in records], dtype=np.int64)
+            for column in DATE_COLUMNS
+        }
+        self.ids = {
+            column: np.array([(record.get(column) or '').encode('ascii') for record in records], dtype='S')
+            for column in ID_COLUMNS
+        }
+        self.score_band = np.array(
+            [record.get('score_band_range_cd') or 0 for record in records], dtype=np.int8
+        )
+        self.row_index = {question_id: row for row, question_id in enumerate(self.ids['questionId'])}
+        # Whether the question file has been fetched into its folder, kept current by refresh_available()
+        self.available = np.zeros(self.size, dtype=bool)
+        self.folder_mtimes = {}
+        # Every *.json file found in each folder, including questions missing from the manifests
+        self.folder_file_counts = {}
+        self.refresh_available()
+
+    @classmethod
+    def load(cls, manifest_dir: str = 'questionData') -> 'MetadataTable':
+        """Load every manifest and mark which questions exist on disk"""
+        records = []
+        for manifest in sorted(glob.glob(os.path.join(manifest_dir, '*', '*.json'))):
+            folder = manifest_folder(manifest)
+            with open(manifest, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+            for item in items:
+                item['folder'] = folder
+                records.append(item)
+
+        return cls(records)
+
+    def refresh_available(self):
+        """Rescan any question folder whose directory mtime changed since the last scan"""
+        folders = self.categories['folder']
+        for code, folder in enumerate(folders.labels):
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                mtime = None
+            if folder in self.folder_mtimes and self.folder_mtimes[folder] == mtime:
+                continue
+
+            # The folder can disappear between stat and scandir; treat it as empty
+            on_disk = []
+            if mtime is not None:
+                try:
+                    with os.scandir(folder) as entries:
+                        on_disk = [
+                            entry.name[:-5].encode('ascii', 'replace') for entry in entries
+                            if entry.name.endswith('.json') and not entry.name.startswith('.')
+                        ]
+                except OSError:
+                    mtime = None
+            rows = np.flatnonzero(folders.codes == code)
+            self.available[rows] = np.isin(self.ids['questionId'][rows], on_disk)
+            self.folder_mtimes[folder] = mtime
+            self.folder_file_counts[folder] = len(on_disk)
+
+    def __len__(self):
+        return self.size
+
+    def record(self, question_id: str) -> Dict:
+        """Rebuild the manifest record for a question, or {} if no manifest lists it"""
+        row = self.row_index.get(question_id.encode('ascii', 'replace'))
+        if row is None:
+            return {}
+        # Missing ids are stored as b'' and come back as None, as in the manifests
+        record = {column: self.ids[column][row].decode('ascii') or None for column in ID_COLUMNS}
+        for column, category in self.categories.items():
+            if column != 'folder':
+                record[column] = category[row]
+        for column, values in self.dates.items():
+            record[column] = int(values[row])
+        record['score_band_range_cd'] = int(self.score_band[row])
+        return record
+
+    def _dimension(self, name: str) -> Tuple[np.ndarray, List]:
+        """Return (codes, labels) for a public dimension name"""
+        column = DIMENSIONS[name]
+        if column == 'score_band_range_cd':
+            labels, codes = np.unique(self.score_band, return_inverse=True)
+            return codes, [int(label) for label in labels]
+        category = self.categories[column]
+        return category.codes, category.labels
+
+    def mask(self, filters: Optional[Dict[str, str]] = None, available_only: bool = False) -> np.ndarray:
+        """Boolean row mask for equality filters on public dimensions"""
+        if available_only:
+            self.refresh_available()
+            mask = self.available.copy()
+        else:
+            mask = np.ones(self.size, dtype=bool)
+        for name, value in (filters or {}).items():
+            column = DIMENSIONS[name]
+            if column == 'score_band_range_cd':
+                if not str(value).isdigit():
+                    raise ValueError(f"Invalid score band: {value}")
+                mask &= self.score_band == int(value)
+            else:
+                mask &= self.categories[column].codes == self.categories[column].code_of(value)
+        return mask
+
+    def group_counts(self, by: Iterable[str], mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """Count rows for every combination of the given dimensions that occurs"""
+        by = list(by)
+        if mask is None:
+            mask = np.ones(self.size, dtype=bool)
+        if not by:
+            return [{'count': int(mask.sum())}]
+
+        dimensions = [self._dimension(name) for name in by]
+        shape = tuple(len(labels) for _, labels in dimensions)
+        keys = np.ravel_multi_index([codes[mask].astype(np.int64) for codes, _ in dimensions], shape)
+        counts = np.bincount(keys, minlength=int(np.prod(shape)))
+
+        groups = []
+        for key in np.flatnonzero(counts):
+            group = {}
+            for name, (_, labels), index in zip(by, dimensions, np.unravel_index(key, shape)):
+                group[name] = labels[index]
+            group['count'] = int(counts[key])
+            groups.append(group)
+        return groups
+
+    def distribution(self, name: str, mask: Optional[np.ndarray] = None) -> Dict:
+        """Count rows per label of a single dimension"""
+        codes, labels = self._dimension(name)
+        if mask is not None:
+            codes = codes[mask]
+        counts = np.bincount(codes.astype(np.int64), minlength=len(labels))
+        return {str(labels[index]): int(counts[index]) for index in np.flatnonzero(counts)}
+
+    def folder_counts(self) -> Dict[str, int]:
+        """Number of question files on disk per manifest folder, matching a *.json glob"""
+        self.refresh_available()
+        return dict(self.folder_file_counts)
+
+    def stats(self, by: Iterable[str], filters: Optional[Dict[str, str]] = None,
+              available_only: bool = False) -> Dict:
+        """Counts by the given dimensions plus per-dimension distributions"""
+        by = list(by)
+        mask = self.mask(filters, available_only)
+        return {
+            'total': int(mask.sum()),
+            'group_by': by,
+            'groups': self.group_counts(by, mask),
+            'distributions': {name: self.distribution(name, mask) for name in by},
+        }
@@ -9,15 +9,8 @@ import logging
 from datetime import datetime
 import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_calls.log'),
-        logging.StreamHandler()
-    ]
-)
+from api_logging import RequestLog, setup_logging
+
 
 class QuestionBankProcessor:
     def __init__(self):
@@ -28,6 +21,7 @@ class QuestionBankProcessor:
         }
         self.max_concurrent = 50  # Maximum concurrent requests
         self.timeout = aiohttp.ClientTimeout(total=30)
+        self.request_log = RequestLog()
         
     def list_available_files(self) -> Dict[str, List[str]]:
         """List all JSON files in eng and math directories"""
@@ -110,6 +104,7 @@ class QuestionBankProcessor:
     
     async def make_api_call(self, session: aiohttp.ClientSession, external_id: str) -> Optional[Dict]:
         """Make async API call to get question data"""
+        start = time.perf_counter()
         try:
             payload = {"external_id": external_id}
             
@@ -118,17 +113,21 @@ class QuestionBankProcessor:
                 json=payload,
                 headers=self.headers
             ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    logging.warning(f"Rate limited (429) for external_id: {external_id}")
-                    return None
-                else:
-                    logging.error(f"API call failed with status {response.status} for external_id: {external_id}")
-                    return None
+                body = await response.read()
+                data = None
+                error = None
+                status = response.status
+                if status == 200:
+                    # Decode before recording so a bad body is counted once, as a failure
+                    try:
+                        data = json.loads(body)
+                    except ValueError as e:
+                        status, error = 'invalid_json', str(e)
+                self.request_log.record(external_id, status, time.perf_counter() - start, len(body), error=error)
+                return data
                 
         except Exception as e:
-            logging.error(f"Error making API call for external_id {external_id}: {e}")
+            self.request_log.record(external_id, 'error', time.perf_counter() - start, error=str(e))
             return None
     
     async def save_question_data(self, folder_path: str, question_id: str, data: Dict) -> bool:
@@ -228,6 +227,7 @@ class QuestionBankProcessor:
                 print(f"Progress: {completed}/{total_questions} ({progress:.1f}%) - Rate: {rate:.1f} req/sec")
         
         # Final summary
+        self.request_log.write_summary()
         elapsed_total = time.time() - start_time
         print("\n" + "="*50)
         print("PROCESSING COMPLETE")
@@ -314,8 +314,12 @@ class QuestionBankProcessor:
 
 def main():
     """Main function"""
-    processor = QuestionBankProcessor()
-    processor.run()
+    listener = setup_logging()
+    try:
+        processor = QuestionBankProcessor()
+        processor.run()
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -8,15 +8,8 @@ from typing import Dict, List, Optional
 import logging
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_calls.log'),
-        logging.StreamHandler()
-    ]
-)
+from api_logging import RequestLog, setup_logging
+
 
 class QuestionBankProcessor:
     def __init__(self):
@@ -27,6 +20,8 @@ class QuestionBankProcessor:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Requests are slow here, so sample successes more often than the async fetcher
+        self.request_log = RequestLog(sample_every=int(os.environ.get('API_LOG_SAMPLE', '10')))
         
     def list_available_files(self) -> Dict[str, List[str]]:
         """List all JSON files in eng and math directories"""
@@ -109,6 +104,7 @@ class QuestionBankProcessor:
     
     def make_api_call(self, external_id: str) -> Optional[Dict]:
         """Make API call to get question data"""
+        start = time.perf_counter()
         try:
             payload = {"external_id": external_id}
             
@@ -117,18 +113,20 @@ class QuestionBankProcessor:
                 json=payload,
                 timeout=30
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                logging.warning(f"Rate limited (429) for external_id: {external_id}")
-                return None
-            else:
-                logging.error(f"API call failed with status {response.status_code} for external_id: {external_id}")
-                return None
+            data = None
+            error = None
+            status = response.status_code
+            if status == 200:
+                # Decode before recording so a bad body is counted once, as a failure
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    status, error = 'invalid_json', str(e)
+            self.request_log.record(external_id, status, time.perf_counter() - start, len(response.content), error=error)
+            return data
                 
         except Exception as e:
-            logging.error(f"Error making API call for external_id {external_id}: {e}")
+            self.request_log.record(external_id, 'error', time.perf_counter() - start, error=str(e))
             return None
     
     def save_question_data(self, folder_path: str, question_id: str, data: Dict) -> bool:
@@ -165,7 +163,7 @@ class QuestionBankProcessor:
             # Check if file already exists
             output_path = os.path.join(output_folder, f"{question_id}.json")
             if os.path.exists(output_path):
-                logging.info(f"Skipping {question_id} - file already exists")
+                logging.debug(f"Skipping {question_id} - file already exists")
                 processed += 1
                 successful += 1
                 continue
@@ -178,12 +176,12 @@ class QuestionBankProcessor:
             if question_data:
                 if self.save_question_data(output_folder, question_id, question_data):
                     successful += 1
-                    logging.info(f"Successfully saved {question_id}")
+                    logging.debug(f"Successfully saved {question_id}")
                 else:
                     failed += 1
             else:
                 failed += 1
-                logging.error(f"Failed to get data for {question_id}")
+                logging.debug(f"Failed to get data for {question_id}")
             
             processed += 1
             
@@ -196,6 +194,7 @@ class QuestionBankProcessor:
                 print(f"Progress: {i}/{total_questions} ({(i/total_questions)*100:.1f}%)")
         
         # Final summary
+        self.request_log.write_summary()
         print("\n" + "="*50)
         print("PROCESSING COMPLETE")
         print("="*50)
@@ -259,8 +258,12 @@ class QuestionBankProcessor:
 
 def main():
     """Main function"""
-    processor = QuestionBankProcessor()
-    processor.run()
+    listener = setup_logging()
+    try:
+        processor = QuestionBankProcessor()
+        processor.run()
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()